@@ -0,0 +1,115 @@
+import glob
+import hashlib
+import os
+import re
+import ahocorasick
+from typing import Iterable, Optional, Set
+
+try:
+    import hyperscan
+except ImportError:  # no wheel for this platform; fall back to Aho-Corasick
+    hyperscan = None
+
+_PACKAGE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+def _database_path(keywords: Iterable[str], flags: int) -> str:
+    """Location of the prebuilt database for this exact keyword list and flag set"""
+    digest = hashlib.sha256(f'{flags}:'.encode() + '\n'.join(keywords).encode()).hexdigest()[:16]
+    return os.path.join(_PACKAGE_DIR, f'keywords-{digest}.hsdb')
+
+class KeywordScanner:
+    """Case-insensitive multi-keyword scanner used by the content filter"""
+
+    def __init__(self, keywords: Iterable[str]):
+        self.keywords = tuple(keyword.lower() for keyword in keywords)
+
+        # First characters of the keywords in either case; text containing
+        # none of them cannot match and is cleared without a full scan
+        self._first_chars = frozenset(
+            c for keyword in self.keywords for c in (keyword[0], keyword[0].upper())
+        )
+
+        self._hs_db = None
+        self._automaton = None
+        if hyperscan is not None:
+            # Hyperscan compiles the keywords into one SIMD-accelerated DFA
+            # and matches case-insensitively, so the text isn't lowered first
+            self._hs_flags = hyperscan.HS_FLAG_CASELESS | hyperscan.HS_FLAG_SINGLEMATCH
+            self._hs_db = self._load_database() or self._compile_database()
+        else:
+            # Aho-Corasick automaton: one pass over the text finds every keyword
+            self._automaton = ahocorasick.Automaton()
+            for keyword in self.keywords:
+                self._automaton.add_word(keyword, keyword)
+            self._automaton.make_automaton()
+
+    def _compile_database(self):
+        db = hyperscan.Database()
+        db.compile(
+            expressions=[re.escape(keyword).encode() for keyword in self.keywords],
+            ids=list(range(len(self.keywords))),
+            elements=len(self.keywords),
+            flags=[self._hs_flags] * len(self.keywords)
+        )
+        return db
+
+    def _load_database(self) -> Optional['hyperscan.Database']:
+        """
+        Load the database serialized at build time, skipping compilation on
+        cold start. Returns None if it is missing or was built for a
+        different Hyperscan version or CPU.
+        """
+        try:
+            with open(_database_path(self.keywords, self._hs_flags), 'rb') as f:
+                db = hyperscan.loadb(f.read(), hyperscan.HS_MODE_BLOCK)
+            db.scratch = hyperscan.Scratch(db)
+            # Platform mismatches may only surface when scanning, so try one
+            # here rather than failing every content check later
+            db.scan(b'', match_event_handler=lambda *args: None)
+            return db
+        except (OSError, hyperscan.error):
+            return None
+
+    def save_database(self) -> str:
+        """Serialize the compiled database next to this module and return its path"""
+        path = _database_path(self.keywords, self._hs_flags)
+        with open(path, 'wb') as f:
+            f.write(hyperscan.dumpb(self._hs_db))
+        return path
+
+    def scan(self, text: str) -> Set[str]:
+        """Return the set of keywords occurring anywhere in text"""
+        if self._first_chars.isdisjoint(text):
+            return set()
+
+        if self._hs_db is None:
+            return {keyword for _, keyword in self._automaton.iter(text.lower())}
+
+        found = set()
+
+        def on_match(keyword_id, start, end, flags, context):
+            found.add(self.keywords[keyword_id])
+
+        self._hs_db.scan(text.encode('utf-8', 'surrogatepass'), match_event_handler=on_match)
+        return found
+
+
+if __name__ == '__main__':
+    # Build step: prebuild the harmful-pattern database so it ships in the
+    # deployment package. Running this in the Lambda build image matches
+    # the deployed Python and (pinned) hyperscan versions, but not the CPU:
+    # Hyperscan targets the features of the CPU it compiles on, which is the
+    # build host's even in a container. Lambda hosts lacking any of them
+    # reject the database in _load_database's trial scan and compile it on
+    # every cold start instead
+    if hyperscan is None:
+        raise SystemExit('hyperscan is not installed; nothing to prebuild')
+    from app import HARMFUL_PATTERNS
+    scanner = KeywordScanner(HARMFUL_PATTERNS)
+    # Databases for earlier keyword lists would otherwise pile up here and
+    # ship in every deployment package
+    current = _database_path(scanner.keywords, scanner._hs_flags)
+    for path in glob.glob(os.path.join(_PACKAGE_DIR, 'keywords-*.hsdb')):
+        if path != current:
+            os.remove(path)
+    print(scanner.save_database())
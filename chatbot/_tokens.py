@@ -0,0 +1,3 @@
+def approx_tokens(text: str) -> int:
+    """Rough token estimate (~4 characters per token, minimum 1) without splitting the text"""
+    return max(1, len(text) >> 2)
@@ -1,24 +1,70 @@
+import base64
 import json
+import re
+import orjson
 import boto3
 import time
-from typing import Dict, Any
+from typing import Dict, Any, Generator, Optional
+
+from _filter_kernel import KeywordScanner
+from _tokens import approx_tokens
 
 # Set this to True once you have Bedrock access enabled
 USE_BEDROCK = False
 
+# Created once per container so warm invocations reuse the client
+_BEDROCK = boto3.client('bedrock-runtime', region_name='us-east-1') if USE_BEDROCK else None
+
+# Define harmful patterns
+HARMFUL_PATTERNS = (
+    'harmful', 'violent', 'abuse', 'illegal', 'hate', 'discriminatory',
+    'dangerous', 'toxic', 'offensive', 'inappropriate', 'explicit'
+)
+
+# Built once per container so each check is a single pass over the prompt
+_SCANNER = KeywordScanner(HARMFUL_PATTERNS)
+
+# Streamed output is scanned chunk by chunk; carrying this many trailing
+# characters into the next scan catches a pattern split across two chunks
+_STREAM_OVERLAP = max(len(pattern) for pattern in HARMFUL_PATTERNS) - 1
+
+# Shared by every response; never mutated
+_JSON_HEADERS = {'Content-Type': 'application/json'}
+
+# Constant error bodies, serialized once at import
+_ERR_PROMPT_REQUIRED = orjson.dumps({'error': 'Prompt is required'}).decode()
+_ERR_PROMPT_NOT_STRING = orjson.dumps({'error': 'Prompt must be a string'}).decode()
+
+# orjson only handles integers that fit in 64 bits: it refuses to encode
+# larger ones and decodes them as floats. Request bodies holding a run of
+# 20+ digits, and responses orjson can't encode, go through stdlib json
+_LONG_DIGITS = re.compile('[0-9]{20}')
+_LONG_DIGITS_BYTES = re.compile(b'[0-9]{20}')
+
+def _loads(raw: Any) -> Any:
+    """Parse a JSON request body (str or bytes), keeping integers exact"""
+    long_digits = _LONG_DIGITS_BYTES if isinstance(raw, (bytes, bytearray)) else _LONG_DIGITS
+    if long_digits.search(raw):
+        return json.loads(raw)
+    return orjson.loads(raw)
+
+def _dumps(obj: Any) -> str:
+    """Serialize a response body that may echo request values back"""
+    try:
+        return orjson.dumps(obj).decode()
+    except TypeError:
+        return json.dumps(obj, separators=(',', ':'))
+
+def _resp(status_code: int, body: str) -> Dict[str, Any]:
+    """API Gateway proxy response with a JSON body"""
+    return {'statusCode': status_code, 'headers': _JSON_HEADERS, 'body': body}
+
 def content_filter_check(prompt: str) -> Dict[str, Any]:
     """Content filtering logic that works in both mock and real modes"""
     
-    # Define harmful patterns
-    harmful_patterns = [
-        'harmful', 'violent', 'abuse', 'illegal', 'hate', 'discriminatory',
-        'dangerous', 'toxic', 'offensive', 'inappropriate', 'explicit'
-    ]
-    
-    prompt_lower = prompt.lower()
-    
     # Check for harmful patterns
-    detected_patterns = [pattern for pattern in harmful_patterns if pattern in prompt_lower]
+    found = _SCANNER.scan(prompt)
+    detected_patterns = [pattern for pattern in HARMFUL_PATTERNS if pattern in found]
     
     if detected_patterns:
         return {
@@ -30,19 +76,100 @@ def content_filter_check(prompt: str) -> Dict[str, Any]:
     
     return {'blocked': False, 'severity': 'LOW'}
 
+_MOCK_TEMPLATE = (
+    "[MOCK] AI Generated Response for: '{prompt}'\n\n"
+    "This is a simulated Claude 4 Sonnet response. The actual AI response will be much more sophisticated once Bedrock model access is enabled.\n\n"
+    "Parameters used:\n"
+    "- Max tokens: {max_tokens}\n"
+    "- Temperature: {temperature}\n"
+    "- User ID: {user_id}"
+)
+
+def _mock_body(prompt: str, max_tokens: Any, temperature: Any, user_id: str) -> str:
+    """Serialized mock response body built from the constant template"""
+    mock_response = _MOCK_TEMPLATE.format_map({
+        'prompt': prompt,
+        'max_tokens': max_tokens,
+        'temperature': temperature,
+        'user_id': user_id
+    })
+    
+    return _dumps({
+        'generated_text': mock_response,
+        'metadata': {
+            'input_tokens': approx_tokens(prompt),
+            'output_tokens': approx_tokens(mock_response),
+            'response_time_ms': 50,
+            'mock_mode': True,
+            'user_id': user_id,
+            'content_filter_status': 'passed',
+            'note': 'Enable Bedrock Claude 4 Sonnet access to get real AI responses'
+        }
+    })
+
+def _stream_bedrock_text(prompt: str, max_tokens: Any, temperature: Any) -> Generator[str, None, None]:
+    """Yield generated text deltas from Bedrock as the model emits them"""
+    request_body = {
+        "anthropic_version": "bedrock-2023-05-31",
+        "max_tokens": max_tokens,
+        "temperature": temperature,
+        "messages": [{"role": "user", "content": prompt}]
+    }
+    
+    response = _BEDROCK.invoke_model_with_response_stream(
+        modelId="anthropic.claude-sonnet-4-20250514-v1:0",
+        body=orjson.dumps(request_body)
+    )
+    
+    stream = response['body']
+    try:
+        for event in stream:
+            chunk = event.get('chunk')
+            if chunk is None:
+                continue
+            payload = orjson.loads(chunk['bytes'])
+            if payload.get('type') == 'content_block_delta':
+                yield payload['delta'].get('text', '')
+    finally:
+        # Stops the transfer if the caller abandons the stream early
+        stream.close()
+
+def _read_filtered_stream(deltas: Generator[str, None, None]) -> Optional[str]:
+    """Join streamed text, or return None as soon as it contains a harmful pattern"""
+    parts = []
+    tail = ''
+    try:
+        for delta in deltas:
+            window = tail + delta
+            if _SCANNER.scan(window):
+                return None
+            parts.append(delta)
+            tail = window[-_STREAM_OVERLAP:]
+    finally:
+        # Abandons the rest of the Bedrock stream on an early return
+        deltas.close()
+    
+    return ''.join(parts)
+
 def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
     """Text generation handler with Bedrock toggle"""
     
     try:
         # Debug: Print the entire event to CloudWatch logs
-        print(f"Event received: {json.dumps(event)}")
+        # Not on the hot path; stdlib json can encode any event Lambda delivers
+        print(f"Event received: {json.dumps(event, default=str)}")
         
         # Parse request - handle both direct invocation and API Gateway
-        body_str = event.get('body')
-        if body_str is None:
+        raw_body = event.get('body')
+        if raw_body is None:
             body = event
+        elif isinstance(raw_body, dict):
+            body = raw_body
         else:
-            body = json.loads(body_str)
+            if event.get('isBase64Encoded'):
+                raw_body = base64.b64decode(raw_body)
+            # str and bytes parse alike, so no intermediate decode
+            body = _loads(raw_body)
             
         prompt = body.get('prompt', body.get('message', ''))
         max_tokens = body.get('max_tokens', 1000)
@@ -50,11 +177,11 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
         user_id = body.get('user_id', 'anonymous')
         
         if not prompt:
-            return {
-                'statusCode': 400,
-                'headers': {'Content-Type': 'application/json'},
-                'body': json.dumps({'error': 'Prompt is required'})
-            }
+            return _resp(400, _ERR_PROMPT_REQUIRED)
+        
+        # The scanner only understands text; anything else would skip the filter
+        if not isinstance(prompt, str):
+            return _resp(400, _ERR_PROMPT_NOT_STRING)
         
         # Content filtering check (works in both mock and real modes)
         filter_result = content_filter_check(prompt)
@@ -63,97 +190,48 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
             # Log security event
             print(f"SECURITY ALERT: Content blocked for user {user_id}: {filter_result}")
             
-            return {
-                'statusCode': 400,
-                'headers': {'Content-Type': 'application/json'},
-                'body': json.dumps({
-                    'error': 'Content policy violation detected',
-                    'details': {
-                        'reason': filter_result['reason'],
-                        'severity': filter_result['severity'],
-                        'user_id': user_id,
-                        'timestamp': int(time.time())
-                    },
-                    'message': 'Your request contains content that violates our usage policies. Please modify your prompt and try again.'
-                })
-            }
+            return _resp(400, _dumps({
+                'error': 'Content policy violation detected',
+                'details': {
+                    'reason': filter_result['reason'],
+                    'severity': filter_result['severity'],
+                    'user_id': user_id,
+                    'timestamp': int(time.time())
+                },
+                'message': 'Your request contains content that violates our usage policies. Please modify your prompt and try again.'
+            }))
         
         if USE_BEDROCK:
             # Real Bedrock call
             try:
-                bedrock = boto3.client('bedrock-runtime', region_name='us-east-1')
-                
-                request_body = {
-                    "anthropic_version": "bedrock-2023-05-31",
-                    "max_tokens": max_tokens,
-                    "temperature": temperature,
-                    "messages": [{"role": "user", "content": prompt}]
-                }
-                
-                response = bedrock.invoke_model(
-                    modelId="anthropic.claude-sonnet-4-20250514-v1:0",
-                    body=json.dumps(request_body)
-                )
-                
-                response_body = json.loads(response['body'].read())
-                generated_text = response_body['content'][0]['text']
-                
-                # Additional content filtering on output (for real mode)
-                output_filter = content_filter_check(generated_text)
-                if output_filter['blocked']:
+                # Additional content filtering on output (for real mode), applied
+                # while streaming so a hit stops reading the rest of the response
+                generated_text = _read_filtered_stream(_stream_bedrock_text(prompt, max_tokens, temperature))
+                if generated_text is None:
                     print(f"SECURITY ALERT: Output filtered for user {user_id}")
                     generated_text = "I cannot provide that type of content. Please try a different request."
                 
-                return {
-                    'statusCode': 200,
-                    'headers': {'Content-Type': 'application/json'},
-                    'body': json.dumps({
-                        'generated_text': generated_text,
-                        'metadata': {
-                            'input_tokens': len(prompt.split()) * 1.3,
-                            'output_tokens': len(generated_text.split()) * 1.3,
-                            'response_time_ms': 200,
-                            'model_id': 'anthropic.claude-sonnet-4-20250514-v1:0',
-                            'user_id': user_id,
-                            'content_filter_status': 'passed'
-                        }
-                    })
-                }
+                return _resp(200, _dumps({
+                    'generated_text': generated_text,
+                    'metadata': {
+                        'input_tokens': approx_tokens(prompt),
+                        'output_tokens': approx_tokens(generated_text),
+                        'response_time_ms': 200,
+                        'model_id': 'anthropic.claude-sonnet-4-20250514-v1:0',
+                        'user_id': user_id,
+                        'content_filter_status': 'passed'
+                    }
+                }))
                 
             except Exception as e:
                 print(f"Bedrock error: {str(e)}")
-                return {
-                    'statusCode': 500,
-                    'headers': {'Content-Type': 'application/json'},
-                    'body': json.dumps({'error': f'Bedrock error: {str(e)}'})
-                }
+                return _resp(500, orjson.dumps({'error': f'Bedrock error: {str(e)}'}).decode())
         else:
             # Mock response until Bedrock access is enabled
-            mock_response = f"[MOCK] AI Generated Response for: '{prompt}'\n\nThis is a simulated Claude 4 Sonnet response. The actual AI response will be much more sophisticated once Bedrock model access is enabled.\n\nParameters used:\n- Max tokens: {max_tokens}\n- Temperature: {temperature}\n- User ID: {user_id}"
-            
-            return {
-                'statusCode': 200,
-                'headers': {'Content-Type': 'application/json'},
-                'body': json.dumps({
-                    'generated_text': mock_response,
-                    'metadata': {
-                        'input_tokens': len(prompt.split()),
-                        'output_tokens': len(mock_response.split()),
-                        'response_time_ms': 50,
-                        'mock_mode': True,
-                        'user_id': user_id,
-                        'content_filter_status': 'passed',
-                        'note': 'Enable Bedrock Claude 4 Sonnet access to get real AI responses'
-                    }
-                })
-            }
+            return _resp(200, _mock_body(prompt, max_tokens, temperature, user_id))
         
     except Exception as e:
-        return {
-            'statusCode': 500,
-            'headers': {'Content-Type': 'application/json'},
-            'body': json.dumps({'error': f'Internal server error: {str(e)}'})
-        }
+        return _resp(500, orjson.dumps({'error': f'Internal server error: {str(e)}'}).decode())
 
 def get_usage_stats(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
     """Enhanced usage stats for demo"""
@@ -181,14 +259,6 @@ def get_usage_stats(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
             'status': 'active'
         }
         
-        return {
-            'statusCode': 200,
-            'headers': {'Content-Type': 'application/json'},
-            'body': json.dumps(mock_stats)
-        }
+        return _resp(200, orjson.dumps(mock_stats).decode())
     except Exception as e:
-        return {
-            'statusCode': 500,
-            'headers': {'Content-Type': 'application/json'},
-            'body': json.dumps({'error': str(e)})
-        }
\ No newline at end of file
+        return _resp(500, orjson.dumps({'error': str(e)}).decode())
\ No newline at end of file
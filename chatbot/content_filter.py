@@ -1,15 +1,33 @@
-import re
 import json
 from typing import Dict, List, Tuple
 import boto3
 
+# Module-level client: built once at cold start and shared by every ContentFilter
+_COMPREHEND = boto3.client('comprehend')
+
+def _is_word_char(c: str) -> bool:
+    return c.isalnum() or c == '_'
+
+def _contains_word(text: str, word: str) -> bool:
+    """True if word occurs in text as a whole word (the equivalent of \\bword\\b)"""
+    end = len(text)
+    i = text.find(word)
+    while i >= 0:
+        j = i + len(word)
+        if (i == 0 or not _is_word_char(text[i - 1])) and (j == end or not _is_word_char(text[j])):
+            return True
+        i = text.find(word, i + 1)
+    return False
+
 class ContentFilter:
     def __init__(self):
-        self.comprehend = boto3.client('comprehend')
-        self.blocked_patterns = [
-            r'\b(?:violence|hate|harmful)\b',
-            r'\b(?:illegal|drug)\b',
-            # Add more patterns as needed
+        self.comprehend = _COMPREHEND
+        # Whole-word, case-insensitive matches; plain string search is
+        # cheaper than the regex engine for literal keywords
+        self.blocked_keywords = [
+            'violence', 'hate', 'harmful',
+            'illegal', 'drug',
+            # Add more keywords as needed
         ]
         
     def filter_content(self, text: str) -> Dict:
@@ -24,10 +42,11 @@ class ContentFilter:
         }
         
         # 1. Check custom patterns
-        for pattern in self.blocked_patterns:
-            if re.search(pattern, text, re.IGNORECASE):
+        text_lower = text.lower()
+        for keyword in self.blocked_keywords:
+            if _contains_word(text_lower, keyword):
                 result["is_safe"] = False
-                result["reasons"].append(f"Contains blocked pattern: {pattern}")
+                result["reasons"].append(f"Contains blocked pattern: {keyword}")
         
         # 2. Use AWS Comprehend for sentiment analysis
         try:
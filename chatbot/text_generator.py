@@ -1,10 +1,15 @@
 import boto3
-import json
+import orjson
 from typing import Dict, List, Optional
 
+from _tokens import approx_tokens
+
+# Bedrock client shared across TextGenerator instances for the life of the container
+_BEDROCK = boto3.client('bedrock-runtime', region_name='us-east-1')
+
 class TextGenerator:
     def __init__(self):
-        self.bedrock = boto3.client('bedrock-runtime', region_name='us-east-1')
+        self.bedrock = _BEDROCK
         self.model_id = "anthropic.claude-3-sonnet-20240229-v1:0"
     
     def generate_text(self, prompt: str, max_tokens: int = 1000, 
@@ -32,16 +37,16 @@ class TextGenerator:
             # Make the request
             response = self.bedrock.invoke_model(
                 modelId=self.model_id,
-                body=json.dumps(request_body)
+                body=orjson.dumps(request_body)
             )
             
             # Parse response
-            response_body = json.loads(response['body'].read())
+            response_body = orjson.loads(response['body'].read())
             generated_text = response_body['content'][0]['text']
             
             # Calculate tokens (rough estimation)
-            input_tokens = len(prompt.split()) * 1.3  # Rough estimate
-            output_tokens = len(generated_text.split()) * 1.3
+            input_tokens = approx_tokens(prompt)
+            output_tokens = approx_tokens(generated_text)
             
             return {
                 "success": True,
@@ -1,77 +1,120 @@
 import boto3
+from boto3.dynamodb.types import TypeSerializer
+import concurrent.futures
 import json
-from datetime import datetime
-from typing import Dict, Any
+import time
+from typing import Dict, Any, List, Optional
+
+# Shared AWS clients, constructed on import rather than per UsageMonitor
+_CLOUDWATCH = boto3.client('cloudwatch')
+_DDB = boto3.resource('dynamodb')
+# boto3 resources aren't thread-safe, but clients are; _LOG_POOL workers
+# write through the resource's underlying client instead of a Table
+_DDB_CLIENT = _DDB.meta.client
+_SERIALIZER = TypeSerializer()
+
+USAGE_TABLE_NAME = 'TextGenerationUsage'
+_METRIC_NAMESPACE = 'TextGeneration/Usage'
+
+# Constant parts of the per-request CloudWatch datums; each request copies
+# them and fills in Value and Timestamp
+_METRIC_REQUESTS = {'MetricName': 'TextGenerationRequests', 'Unit': 'Count'}
+_METRIC_INPUT_TOKENS = {'MetricName': 'InputTokens', 'Unit': 'Count'}
+_METRIC_OUTPUT_TOKENS = {'MetricName': 'OutputTokens', 'Unit': 'Count'}
+
+# Both AWS calls are network-bound, so CloudWatch and DynamoDB writes run
+# side by side instead of one after the other
+_LOG_POOL = concurrent.futures.ThreadPoolExecutor(max_workers=4)
+
+def _put_metrics(metrics: List[Dict[str, Any]]) -> None:
+    """Publish metrics to CloudWatch, logging rather than raising on failure"""
+    try:
+        _CLOUDWATCH.put_metric_data(
+            Namespace=_METRIC_NAMESPACE,
+            MetricData=metrics
+        )
+    except Exception as e:
+        print(f"CloudWatch error: {str(e)}")
+
+def _put_item(item: Dict[str, Any]) -> None:
+    """Write a usage item to DynamoDB, logging rather than raising on failure"""
+    try:
+        _DDB_CLIENT.put_item(
+            TableName=USAGE_TABLE_NAME,
+            Item={key: _SERIALIZER.serialize(value) for key, value in item.items()}
+        )
+    except Exception as e:
+        print(f"DynamoDB error: {str(e)}")
 
 class UsageMonitor:
     def __init__(self):
-        self.cloudwatch = boto3.client('cloudwatch')
-        self.dynamodb = boto3.resource('dynamodb')
+        self.cloudwatch = _CLOUDWATCH
+        self.dynamodb = _DDB
         # Create usage table if it doesn't exist
-        self.usage_table_name = 'TextGenerationUsage'
+        self.usage_table_name = USAGE_TABLE_NAME
         
-    def log_usage(self, user_id: str, request_data: Dict[str, Any]) -> None:
-        """Log usage metrics to CloudWatch and DynamoDB"""
+    def log_usage(self, user_id: str, request_data: Dict[str, Any],
+                  now: Optional[float] = None) -> None:
+        """
+        Log usage metrics to CloudWatch and DynamoDB
+        now: request time from time.time(), if the caller has already read it
+        """
+        if now is None:
+            now = time.time()
+        input_tokens = request_data.get('input_tokens', 0)
+        output_tokens = request_data.get('output_tokens', 0)
         
-        # 1. CloudWatch metrics
+        # 1. CloudWatch metrics, stamped with the request time
         metrics = [
-            {
-                'MetricName': 'TextGenerationRequests',
-                'Value': 1,
-                'Unit': 'Count'
-            },
-            {
-                'MetricName': 'InputTokens',
-                'Value': request_data.get('input_tokens', 0),
-                'Unit': 'Count'
-            },
-            {
-                'MetricName': 'OutputTokens', 
-                'Value': request_data.get('output_tokens', 0),
-                'Unit': 'Count'
-            }
+            {**_METRIC_REQUESTS, 'Value': 1, 'Timestamp': now},
+            {**_METRIC_INPUT_TOKENS, 'Value': input_tokens, 'Timestamp': now},
+            {**_METRIC_OUTPUT_TOKENS, 'Value': output_tokens, 'Timestamp': now}
         ]
         
-        try:
-            self.cloudwatch.put_metric_data(
-                Namespace='TextGeneration/Usage',
-                MetricData=metrics
-            )
-        except Exception as e:
-            print(f"CloudWatch error: {str(e)}")
-        
         # 2. DynamoDB detailed logging
-        try:
-            table = self.dynamodb.Table(self.usage_table_name)
-            table.put_item(
-                Item={
-                    'user_id': user_id,
-                    'timestamp': int(datetime.now().timestamp()),
-                    'request_type': request_data.get('type', 'text_generation'),
-                    'input_tokens': request_data.get('input_tokens', 0),
-                    'output_tokens': request_data.get('output_tokens', 0),
-                    'response_time_ms': request_data.get('response_time_ms', 0),
-                    'filtered': request_data.get('filtered', False)
-                }
-            )
-        except Exception as e:
-            print(f"DynamoDB error: {str(e)}")
+        item = {
+            'user_id': user_id,
+            'timestamp': int(now),
+            'request_type': request_data.get('type', 'text_generation'),
+            'input_tokens': input_tokens,
+            'output_tokens': output_tokens,
+            'response_time_ms': request_data.get('response_time_ms', 0),
+            'filtered': request_data.get('filtered', False)
+        }
+        
+        futures = [
+            _LOG_POOL.submit(_put_metrics, metrics),
+            _LOG_POOL.submit(_put_item, item)
+        ]
+        
+        # Wait so nothing is left in flight when Lambda freezes the environment
+        concurrent.futures.wait(futures)
     
     def get_usage_stats(self, user_id: str, days: int = 7) -> Dict:
         """Get usage statistics for a user"""
         try:
             table = self.dynamodb.Table(self.usage_table_name)
-            # Simple query for recent usage
-            response = table.query(
-                KeyConditionExpression='user_id = :uid',
-                ExpressionAttributeValues={':uid': user_id},
-                ScanIndexForward=False,
-                Limit=100
-            )
+            cutoff = int(time.time()) - days * 86400
+            # Bound the sort key to the requested window and fetch only the
+            # token counts, so older items and unused attributes aren't read
+            query_args = {
+                'KeyConditionExpression': 'user_id = :uid AND #ts >= :cutoff',
+                'ExpressionAttributeNames': {'#ts': 'timestamp'},
+                'ExpressionAttributeValues': {':uid': user_id, ':cutoff': cutoff},
+                'ProjectionExpression': 'input_tokens, output_tokens'
+            }
             
-            items = response.get('Items', [])
-            total_requests = len(items)
-            total_tokens = sum(item.get('input_tokens', 0) + item.get('output_tokens', 0) for item in items)
+            total_requests = 0
+            total_tokens = 0
+            while True:
+                response = table.query(**query_args)
+                items = response.get('Items', [])
+                total_requests += len(items)
+                total_tokens += sum(item.get('input_tokens', 0) + item.get('output_tokens', 0) for item in items)
+                
+                if 'LastEvaluatedKey' not in response:
+                    break
+                query_args['ExclusiveStartKey'] = response['LastEvaluatedKey']
             
             return {
                 'total_requests': total_requests,
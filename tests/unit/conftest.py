@@ -0,0 +1,33 @@
+"""
+Shared setup for the chatbot Lambda unit tests
+"""
+
+import os
+import sys
+
+import pytest
+from botocore.stub import Stubber
+
+# The Lambda modules import each other as top-level modules
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'chatbot'))
+# Module-level boto3 clients need a region, not credentials
+os.environ.setdefault('AWS_DEFAULT_REGION', 'us-east-1')
+
+
+@pytest.fixture
+def stub():
+    """Activate a Stubber on a client; every queued response must be used by the end of the test"""
+    stubbers = []
+
+    def activate(client):
+        stubber = Stubber(client)
+        stubber.activate()
+        stubbers.append(stubber)
+        return stubber
+
+    yield activate
+
+    for stubber in stubbers:
+        stubber.deactivate()
+    for stubber in stubbers:
+        stubber.assert_no_pending_responses()
@@ -0,0 +1,93 @@
+"""
+Unit tests for reading Bedrock response streams in the chatbot Lambda
+Run with: python -m pytest tests/unit/test_bedrock_stream.py
+"""
+
+import json
+
+import pytest
+
+import app
+
+
+class FakeEventStream:
+    """Stands in for the EventStream in response['body']; records reads and close()"""
+
+    def __init__(self, events):
+        self.events = events
+        self.read = 0
+        self.closed = False
+
+    def __iter__(self):
+        for event in self.events:
+            self.read += 1
+            yield event
+
+    def close(self):
+        self.closed = True
+
+
+class FakeBedrock:
+    def __init__(self, stream):
+        self.stream = stream
+        self.request = None
+
+    def invoke_model_with_response_stream(self, **kwargs):
+        self.request = kwargs
+        return {'body': self.stream}
+
+
+def _chunk(payload):
+    return {'chunk': {'bytes': json.dumps(payload).encode()}}
+
+
+def _delta(text):
+    return _chunk({'type': 'content_block_delta', 'index': 0, 'delta': {'type': 'text_delta', 'text': text}})
+
+
+@pytest.fixture
+def bedrock(monkeypatch):
+    def install(events):
+        fake = FakeBedrock(FakeEventStream(events))
+        monkeypatch.setattr(app, '_BEDROCK', fake)
+        return fake
+    return install
+
+
+class TestStreamBedrockText:
+    """Test event parsing in _stream_bedrock_text"""
+
+    def test_yields_only_text_deltas(self, bedrock):
+        fake = bedrock([
+            _chunk({'type': 'message_start', 'message': {}}),
+            _chunk({'type': 'content_block_start', 'index': 0}),
+            _delta('Hello'),
+            {'metadata': {'usage': {}}},
+            _delta(' world'),
+            _chunk({'type': 'content_block_stop', 'index': 0}),
+            _chunk({'type': 'message_stop'})
+        ])
+
+        assert list(app._stream_bedrock_text('hi', 100, 0.5)) == ['Hello', ' world']
+        assert fake.stream.closed
+
+    def test_request_body(self, bedrock):
+        fake = bedrock([])
+        list(app._stream_bedrock_text('hi', 100, 0.5))
+
+        assert json.loads(fake.request['body']) == {
+            'anthropic_version': 'bedrock-2023-05-31',
+            'max_tokens': 100,
+            'temperature': 0.5,
+            'messages': [{'role': 'user', 'content': 'hi'}]
+        }
+
+    def test_stream_closed_on_early_exit(self, bedrock):
+        fake = bedrock([_delta('one'), _delta('two'), _delta('three')])
+
+        deltas = app._stream_bedrock_text('hi', 100, 0.5)
+        assert next(deltas) == 'one'
+        deltas.close()
+
+        assert fake.stream.closed
+        assert fake.stream.read == 1
@@ -0,0 +1,87 @@
+"""
+Unit tests for the ContentFilter keyword and sentiment checks
+Run with: python -m pytest tests/unit/test_content_filter.py
+"""
+
+import pytest
+from botocore.stub import ANY
+
+import content_filter
+from content_filter import ContentFilter, _contains_word
+
+
+@pytest.fixture
+def comprehend(stub):
+    return stub(content_filter._COMPREHEND)
+
+
+def _sentiment(sentiment='NEUTRAL', negative=0.1):
+    return {
+        'Sentiment': sentiment,
+        'SentimentScore': {'Positive': 0.1, 'Negative': negative, 'Neutral': 0.8, 'Mixed': 0.0}
+    }
+
+
+class TestContainsWord:
+    """Test whole-word matching used by ContentFilter"""
+
+    def test_later_whole_word_after_substring(self):
+        assert _contains_word('hateful hate', 'hate') == True
+
+    def test_substring_only(self):
+        assert _contains_word('hateful', 'hate') == False
+
+    def test_underscore_is_a_word_character(self):
+        assert _contains_word('my_hate', 'hate') == False
+
+    def test_punctuation_and_edges(self):
+        assert _contains_word('hate.', 'hate') == True
+        assert _contains_word('(hate)', 'hate') == True
+        assert _contains_word('hate', 'hate') == True
+
+
+class TestFilterContent:
+    """Test ContentFilter.filter_content with a stubbed Comprehend client"""
+
+    def test_safe_text_passes_through(self, comprehend):
+        comprehend.add_response('detect_sentiment', _sentiment(),
+                                {'Text': 'a pleasant request', 'LanguageCode': 'en'})
+
+        result = ContentFilter().filter_content('a pleasant request')
+
+        assert result == {'is_safe': True, 'filtered_text': 'a pleasant request', 'reasons': []}
+
+    def test_keywords_matched_case_insensitively(self, comprehend):
+        comprehend.add_response('detect_sentiment', _sentiment(), {'Text': ANY, 'LanguageCode': 'en'})
+
+        result = ContentFilter().filter_content('ILLEGAL Hate')
+
+        assert result['is_safe'] == False
+        assert result['filtered_text'] == '[Content filtered due to policy violations]'
+        assert result['reasons'] == ['Contains blocked pattern: hate', 'Contains blocked pattern: illegal']
+
+    def test_one_reason_per_keyword(self, comprehend):
+        comprehend.add_response('detect_sentiment', _sentiment(), {'Text': ANY, 'LanguageCode': 'en'})
+
+        result = ContentFilter().filter_content('hate, hate and more hate')
+
+        assert result['reasons'] == ['Contains blocked pattern: hate']
+
+    def test_substring_is_not_blocked(self, comprehend):
+        comprehend.add_response('detect_sentiment', _sentiment(), {'Text': ANY, 'LanguageCode': 'en'})
+
+        assert ContentFilter().filter_content('hateful drugstore')['is_safe'] == True
+
+    def test_high_negative_sentiment(self, comprehend):
+        comprehend.add_response('detect_sentiment', _sentiment('NEGATIVE', 0.95),
+                                {'Text': ANY, 'LanguageCode': 'en'})
+
+        result = ContentFilter().filter_content('this is awful')
+
+        assert result['is_safe'] == False
+        assert result['reasons'] == ['High negative sentiment: 0.95']
+
+    def test_comprehend_error_does_not_block(self, comprehend):
+        comprehend.add_client_error('detect_sentiment', 'InternalServerException')
+
+        assert ContentFilter().filter_content('a pleasant request')['is_safe'] == True
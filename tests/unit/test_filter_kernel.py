@@ -0,0 +1,101 @@
+"""
+Unit tests for the KeywordScanner backends
+Run with: python -m pytest tests/unit/test_filter_kernel.py
+"""
+
+import os
+
+import pytest
+
+import _filter_kernel
+from _filter_kernel import KeywordScanner
+
+
+@pytest.fixture(params=['hyperscan', 'aho-corasick'])
+def scanner(request, monkeypatch):
+    """KeywordScanner built with each available backend"""
+    if request.param == 'hyperscan':
+        if _filter_kernel.hyperscan is None:
+            pytest.skip('hyperscan is not installed')
+    else:
+        monkeypatch.setattr(_filter_kernel, 'hyperscan', None)
+    return KeywordScanner(['harmful', 'hate', 'toxic'])
+
+
+class TestKeywordScanner:
+    """Test both scanner backends"""
+
+    def test_finds_keywords_case_insensitively(self, scanner):
+        assert scanner.scan('This is HATE and ToXiC') == {'hate', 'toxic'}
+
+    def test_substring_matches(self, scanner):
+        assert scanner.scan('hateful') == {'hate'}
+
+    def test_no_match(self, scanner):
+        assert scanner.scan('a perfectly pleasant request') == set()
+
+    def test_prefilter_clears_text_without_first_chars(self, scanner):
+        assert scanner.scan('xyz') == set()
+
+
+@pytest.fixture
+def database_dir(tmp_path, monkeypatch):
+    """Prebuilt databases are read from and written to tmp_path; counts compilations"""
+    if _filter_kernel.hyperscan is None:
+        pytest.skip('hyperscan is not installed')
+    monkeypatch.setattr(_filter_kernel, '_PACKAGE_DIR', str(tmp_path))
+
+    compiled = []
+    compile_database = KeywordScanner._compile_database
+
+    def counting_compile(self):
+        compiled.append(self.keywords)
+        return compile_database(self)
+
+    monkeypatch.setattr(KeywordScanner, '_compile_database', counting_compile)
+    return tmp_path, compiled
+
+
+class TestPrebuiltDatabase:
+    """Test loading the Hyperscan database serialized at build time"""
+
+    KEYWORDS = ['harmful', 'hate', 'toxic']
+
+    def test_round_trip(self, database_dir):
+        tmp_path, compiled = database_dir
+        path = KeywordScanner(self.KEYWORDS).save_database()
+        assert os.path.dirname(path) == str(tmp_path)
+
+        scanner = KeywordScanner(self.KEYWORDS)
+
+        assert len(compiled) == 1
+        assert scanner._hs_db is not None
+        assert scanner.scan('This is HATE and ToXiC') == {'hate', 'toxic'}
+
+    def test_missing_file_compiles(self, database_dir):
+        tmp_path, compiled = database_dir
+
+        scanner = KeywordScanner(self.KEYWORDS)
+
+        assert len(compiled) == 1
+        assert scanner.scan('hateful') == {'hate'}
+
+    def test_corrupt_file_falls_back_to_compiling(self, database_dir):
+        tmp_path, compiled = database_dir
+        path = KeywordScanner(self.KEYWORDS).save_database()
+        with open(path, 'wb') as f:
+            f.write(os.urandom(512))
+
+        scanner = KeywordScanner(self.KEYWORDS)
+
+        assert len(compiled) == 2
+        assert scanner.scan('hateful') == {'hate'}
+
+    def test_database_for_other_keywords_is_ignored(self, database_dir):
+        tmp_path, compiled = database_dir
+        KeywordScanner(['violent']).save_database()
+
+        scanner = KeywordScanner(self.KEYWORDS)
+
+        assert len(compiled) == 2
+        assert scanner.scan('violent') == set()
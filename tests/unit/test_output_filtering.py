@@ -0,0 +1,84 @@
+"""
+Unit tests for content filtering of prompts and streamed output in the chatbot Lambda
+Run with: python -m pytest tests/unit/test_output_filtering.py
+"""
+
+import json
+
+import pytest
+
+import app
+
+
+class TestContentFilterCheck:
+    """Test the content_filter_check contract, whichever scanner backend is used"""
+
+    def test_clean_prompt(self):
+        assert app.content_filter_check('a perfectly pleasant request') == {'blocked': False, 'severity': 'LOW'}
+
+    def test_patterns_reported_in_harmful_patterns_order(self):
+        result = app.content_filter_check('EXPLICIT and toxic and Harmful')
+
+        assert result['blocked'] == True
+        assert result['reason'] == 'Content policy violation'
+        assert result['detected_patterns'] == ['harmful', 'toxic', 'explicit']
+
+    def test_substring_matches(self):
+        assert app.content_filter_check('hateful')['detected_patterns'] == ['hate']
+
+    def test_repeated_pattern_reported_once(self):
+        assert app.content_filter_check('toxic toxic toxic')['detected_patterns'] == ['toxic']
+
+    def test_severity_threshold(self):
+        assert app.content_filter_check('hate')['severity'] == 'MEDIUM'
+        assert app.content_filter_check('hate and toxic')['severity'] == 'MEDIUM'
+        assert app.content_filter_check('hate, toxic and illegal')['severity'] == 'HIGH'
+
+
+def _deltas(chunks, consumed):
+    """Generator standing in for _stream_bedrock_text; records what was read and whether it was closed"""
+    try:
+        for chunk in chunks:
+            consumed.append(chunk)
+            yield chunk
+    finally:
+        consumed.append('<closed>')
+
+
+class TestReadFilteredStream:
+    """Test output filtering on streamed Bedrock text"""
+
+    def test_clean_stream_is_joined(self):
+        consumed = []
+        assert app._read_filtered_stream(_deltas(['Hel', 'lo ', 'there'], consumed)) == 'Hello there'
+        assert consumed[-1] == '<closed>'
+
+    def test_keyword_split_across_deltas(self):
+        consumed = []
+        assert app._read_filtered_stream(_deltas(['this is TO', 'XIC output'], consumed)) is None
+
+    def test_keyword_split_across_three_deltas(self):
+        consumed = []
+        assert app._read_filtered_stream(_deltas(['disc', 'rimin', 'atory'], consumed)) is None
+
+    def test_keyword_in_single_character_deltas(self):
+        consumed = []
+        assert app._read_filtered_stream(_deltas(list('so very explicit'), consumed)) is None
+
+    def test_stream_closed_early_on_hit(self):
+        consumed = []
+        result = app._read_filtered_stream(_deltas(['fine ', 'toxic ', 'never read', 'or this'], consumed))
+
+        assert result is None
+        assert consumed == ['fine ', 'toxic ', '<closed>']
+
+
+class TestPromptValidation:
+    """Test that prompts the content filter can't scan are rejected"""
+
+    @pytest.mark.parametrize('prompt', [['hate speech', 'toxic'], {'toxic': 1}, 42])
+    def test_non_string_prompt_rejected(self, prompt):
+        response = app.lambda_handler({'prompt': prompt}, None)
+
+        assert response['statusCode'] == 400
+        assert json.loads(response['body']) == {'error': 'Prompt must be a string'}
@@ -0,0 +1,80 @@
+"""
+Unit tests for lambda_handler request body parsing
+Run with: python -m pytest tests/unit/test_request_parsing.py
+"""
+
+import base64
+import json
+
+import app
+
+
+class TestRequestParsing:
+    """Test lambda_handler body parsing in mock mode"""
+
+    @staticmethod
+    def _generated_text(response):
+        assert response['statusCode'] == 200
+        return json.loads(response['body'])['generated_text']
+
+    def test_base64_body(self):
+        payload = json.dumps({'prompt': 'hello from base64'}).encode()
+        event = {'body': base64.b64encode(payload).decode(), 'isBase64Encoded': True}
+
+        assert 'hello from base64' in self._generated_text(app.lambda_handler(event, None))
+
+    def test_bytes_body(self):
+        event = {'body': json.dumps({'prompt': 'hello from bytes'}).encode()}
+
+        assert 'hello from bytes' in self._generated_text(app.lambda_handler(event, None))
+
+    def test_dict_body(self):
+        event = {'body': {'prompt': 'hello from dict'}}
+
+        assert 'hello from dict' in self._generated_text(app.lambda_handler(event, None))
+
+    def test_direct_invocation(self):
+        assert 'hello direct' in self._generated_text(app.lambda_handler({'prompt': 'hello direct'}, None))
+
+    def test_mock_body_reflects_each_request(self):
+        first = self._generated_text(app.lambda_handler({'prompt': 'x', 'temperature': True}, None))
+        second = self._generated_text(app.lambda_handler({'prompt': 'x', 'temperature': 1}, None))
+
+        assert 'Temperature: True' in first
+        assert 'Temperature: 1' in second
+
+
+class TestLargeIntegers:
+    """Test values beyond orjson's 64-bit integer range"""
+
+    @staticmethod
+    def _metadata(response):
+        assert response['statusCode'] == 200
+        return json.loads(response['body'])['metadata']
+
+    def test_direct_invocation_user_id(self):
+        response = app.lambda_handler({'prompt': 'hi', 'user_id': 2**70}, None)
+
+        assert self._metadata(response)['user_id'] == 2**70
+
+    def test_direct_invocation_temperature(self):
+        response = app.lambda_handler({'prompt': 'hi', 'temperature': 2**64}, None)
+
+        assert response['statusCode'] == 200
+
+    def test_api_gateway_user_id_stays_an_integer(self):
+        event = {'body': json.dumps({'prompt': 'hi', 'user_id': 2**70})}
+
+        assert self._metadata(app.lambda_handler(event, None))['user_id'] == 2**70
+
+    def test_base64_body(self):
+        payload = json.dumps({'prompt': 'hi', 'user_id': 2**70}).encode()
+        event = {'body': base64.b64encode(payload).decode(), 'isBase64Encoded': True}
+
+        assert self._metadata(app.lambda_handler(event, None))['user_id'] == 2**70
+
+    def test_blocked_response(self):
+        response = app.lambda_handler({'prompt': 'toxic', 'user_id': 2**70}, None)
+
+        assert response['statusCode'] == 400
+        assert json.loads(response['body'])['details']['user_id'] == 2**70
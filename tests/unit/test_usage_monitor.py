@@ -0,0 +1,128 @@
+"""
+Unit tests for UsageMonitor, driven by botocore Stubbers on the shared clients
+Run with: python -m pytest tests/unit/test_usage_monitor.py
+"""
+
+import pytest
+
+import usage_monitor
+from usage_monitor import UsageMonitor
+
+
+@pytest.fixture
+def cloudwatch(stub):
+    return stub(usage_monitor._CLOUDWATCH)
+
+
+@pytest.fixture
+def dynamodb(stub):
+    # Table operations on the resource go through this same client
+    return stub(usage_monitor._DDB.meta.client)
+
+
+class TestLogUsage:
+    """Test that each log_usage call writes its item and datums before returning"""
+
+    def test_writes_item_through_client(self, cloudwatch, dynamodb):
+        cloudwatch.add_response('put_metric_data', {})
+        dynamodb.add_response('put_item', {}, {
+            'TableName': 'TextGenerationUsage',
+            'Item': {
+                'user_id': {'S': 'alice'},
+                'timestamp': {'N': '1700000000'},
+                'request_type': {'S': 'text_generation'},
+                'input_tokens': {'N': '3'},
+                'output_tokens': {'N': '5'},
+                'response_time_ms': {'N': '120'},
+                'filtered': {'BOOL': False}
+            }
+        })
+
+        UsageMonitor().log_usage('alice', {
+            'input_tokens': 3, 'output_tokens': 5, 'response_time_ms': 120
+        }, now=1700000000.5)
+
+    def test_metrics_sent_with_request_time(self, cloudwatch, dynamodb):
+        now = 1700000000.5
+        cloudwatch.add_response('put_metric_data', {}, {
+            'Namespace': 'TextGeneration/Usage',
+            'MetricData': [
+                {'MetricName': 'TextGenerationRequests', 'Unit': 'Count', 'Value': 1, 'Timestamp': now},
+                {'MetricName': 'InputTokens', 'Unit': 'Count', 'Value': 3, 'Timestamp': now},
+                {'MetricName': 'OutputTokens', 'Unit': 'Count', 'Value': 5, 'Timestamp': now}
+            ]
+        })
+        dynamodb.add_response('put_item', {})
+
+        UsageMonitor().log_usage('alice', {'input_tokens': 3, 'output_tokens': 5}, now=now)
+
+        # The shared templates are copied, never filled in place
+        assert usage_monitor._METRIC_INPUT_TOKENS == {'MetricName': 'InputTokens', 'Unit': 'Count'}
+
+    def test_each_call_writes_immediately(self, cloudwatch, dynamodb):
+        monitor = UsageMonitor()
+        for _ in range(2):
+            cloudwatch.add_response('put_metric_data', {})
+            dynamodb.add_response('put_item', {})
+
+            monitor.log_usage('alice', {}, now=1700000000)
+
+            cloudwatch.assert_no_pending_responses()
+            dynamodb.assert_no_pending_responses()
+
+    def test_service_errors_are_not_raised(self, cloudwatch, dynamodb):
+        cloudwatch.add_client_error('put_metric_data', 'InternalServiceError')
+        dynamodb.add_client_error('put_item', 'ProvisionedThroughputExceededException')
+
+        UsageMonitor().log_usage('alice', {}, now=1700000000)
+
+
+class TestGetUsageStats:
+    """Test the time-bounded, paginated usage query"""
+
+    @staticmethod
+    def _expected_params(cutoff, start_key=None):
+        params = {
+            'TableName': 'TextGenerationUsage',
+            'KeyConditionExpression': 'user_id = :uid AND #ts >= :cutoff',
+            'ExpressionAttributeNames': {'#ts': 'timestamp'},
+            'ExpressionAttributeValues': {':uid': 'alice', ':cutoff': cutoff},
+            'ProjectionExpression': 'input_tokens, output_tokens'
+        }
+        if start_key is not None:
+            params['ExclusiveStartKey'] = start_key
+        return params
+
+    def test_follows_last_evaluated_key(self, dynamodb, monkeypatch):
+        monkeypatch.setattr(usage_monitor.time, 'time', lambda: 1700000000.9)
+        cutoff = 1700000000 - 2 * 86400
+        last_key = {'user_id': 'alice', 'timestamp': 1699900000}
+
+        dynamodb.add_response('query', {
+            'Items': [
+                {'input_tokens': {'N': '3'}, 'output_tokens': {'N': '5'}},
+                {'input_tokens': {'N': '2'}, 'output_tokens': {'N': '2'}}
+            ],
+            'LastEvaluatedKey': {'user_id': {'S': 'alice'}, 'timestamp': {'N': '1699900000'}}
+        }, self._expected_params(cutoff))
+        dynamodb.add_response('query', {
+            'Items': [{'input_tokens': {'N': '1'}, 'output_tokens': {'N': '3'}}]
+        }, self._expected_params(cutoff, last_key))
+
+        stats = UsageMonitor().get_usage_stats('alice', days=2)
+
+        assert stats['total_requests'] == 3
+        assert stats['total_tokens'] == 16
+
+    def test_no_items(self, dynamodb, monkeypatch):
+        monkeypatch.setattr(usage_monitor.time, 'time', lambda: 1700000000)
+        dynamodb.add_response('query', {'Items': []}, self._expected_params(1700000000 - 7 * 86400))
+
+        stats = UsageMonitor().get_usage_stats('alice')
+
+        assert stats == {'total_requests': 0, 'total_tokens': 0, 'average_tokens_per_request': 0}
+
+    def test_query_error_is_reported(self, dynamodb):
+        dynamodb.add_client_error('query', 'ResourceNotFoundException')
+
+        assert 'error' in UsageMonitor().get_usage_stats('alice')